@@ -0,0 +1,134 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+# query() arguments that filter performances, mapped to the matching performances() arguments
+PERFORMANCE_FILTERS = {
+    'performed_since': 'since',
+    'performed_until': 'until',
+    'venue': 'venue',
+    'country': 'country',
+    'performer': 'performer',
+}
+
+
+class WorksCatalog:
+    """ In-memory index over the works catalog, built once at load time """
+
+    def __init__(self, works: list) -> None:
+        self.works = works
+        self.__ranks = {}
+
+        self.__by_year = sorted(range(len(works)), key=lambda i: works[i]['year'])
+        self.__years = [works[i]['year'] for i in self.__by_year]
+        self.__commissioned = set()
+        self.__awarded = set()
+
+        # performances are flattened into parallel lists, addressed by their position
+        self.__perf_work = []
+        self.__perf_items = []
+        self.__perf_by_venue = defaultdict(list)
+        self.__perf_by_country = defaultdict(list)
+        self.__perf_by_performer = defaultdict(list)
+
+        for i, work in enumerate(works):
+            if work['commission']:
+                self.__commissioned.add(i)
+            if work['awards']:
+                self.__awarded.add(i)
+            for performance in work['performances'] or ():
+                k = len(self.__perf_items)
+                self.__perf_work.append(i)
+                self.__perf_items.append(performance)
+                self.__perf_by_venue[performance['venue']].append(k)
+                self.__perf_by_country[performance['country']].append(k)
+                for performer in performance.get('performers') or []:
+                    self.__perf_by_performer[performer['name']].append(k)
+
+        self.__by_perf_date = sorted(range(len(self.__perf_items)), key=lambda k: self.__perf_items[k]['date'])
+        self.__perf_dates = [self.__perf_items[k]['date'] for k in self.__by_perf_date]
+
+    def __len__(self) -> int:
+        return len(self.works)
+
+    def query(self,
+              since: int | None = None,
+              until: int | None = None,
+              commissioned: bool | None = None,
+              awarded: bool | None = None,
+              performed_since: str | None = None,
+              performed_until: str | None = None,
+              venue: str | None = None,
+              country: str | None = None,
+              performer: str | None = None,
+              sort: str | None = 'year',
+              reverse: bool = True) -> list:
+        """
+        Returns the works matching all given filters. Year bounds are inclusive; performance filters
+        select works with at least one performance matching all of them. With sort=None, works keep
+        their catalog order.
+        """
+        ids = None
+        if since is not None or until is not None:
+            lo = 0 if since is None else bisect_left(self.__years, since)
+            hi = len(self.__years) if until is None else bisect_right(self.__years, until)
+            ids = set(self.__by_year[lo:hi])
+        for flag, subset in [(commissioned, self.__commissioned), (awarded, self.__awarded)]:
+            if flag is None:
+                continue
+            selected = subset if flag else set(range(len(self.works))) - subset
+            ids = selected if ids is None else ids & selected
+        perf_ids = self.__match_performances(performed_since, performed_until, venue, country, performer)
+        if perf_ids is not None:
+            selected = {self.__perf_work[k] for k in perf_ids}
+            ids = selected if ids is None else ids & selected
+        if ids is None:
+            ids = range(len(self.works))
+        if sort is None:
+            return [self.works[i] for i in sorted(ids)]
+        rank = self.__rank(sort, reverse)
+        return [self.works[i] for i in sorted(ids, key=rank.__getitem__)]
+
+    def performances(self,
+                     since: str | None = None,
+                     until: str | None = None,
+                     venue: str | None = None,
+                     country: str | None = None,
+                     performer: str | None = None,
+                     reverse: bool = True) -> list:
+        """ Returns (work, performance) pairs matching all given filters, sorted by performance date """
+        perf_ids = self.__match_performances(since, until, venue, country, performer)
+        if perf_ids is None:
+            ordered = self.__by_perf_date
+        else:
+            ordered = sorted(perf_ids, key=lambda k: (self.__perf_items[k]['date'], k))
+        if reverse:
+            ordered = ordered[::-1]
+        return [(self.works[self.__perf_work[k]], self.__perf_items[k]) for k in ordered]
+
+    def __match_performances(self, since: str | None, until: str | None, venue: str | None, country: str | None,
+                             performer: str | None) -> set | None:
+        ids = None
+        if since is not None or until is not None:
+            lo = 0 if since is None else bisect_left(self.__perf_dates, since)
+            # dates are ISO strings, so a bare year or month as upper bound must include the whole period
+            hi = len(self.__perf_dates) if until is None else bisect_right(self.__perf_dates, until + '\uffff')
+            ids = set(self.__by_perf_date[lo:hi])
+        for value, table in [(venue, self.__perf_by_venue),
+                             (country, self.__perf_by_country),
+                             (performer, self.__perf_by_performer)]:
+            if value is None:
+                continue
+            selected = set(table.get(value, ()))
+            ids = selected if ids is None else ids & selected
+        return ids
+
+    def __rank(self, field: str, reverse: bool) -> list:
+        """ Position of each work when sorted by field; computed once per ordering """
+        key = (field, reverse)
+        if key not in self.__ranks:
+            order = sorted(range(len(self.works)), key=lambda i: self.works[i][field], reverse=reverse)
+            rank = [0] * len(order)
+            for position, i in enumerate(order):
+                rank[i] = position
+            self.__ranks[key] = rank
+        return self.__ranks[key]
@@ -0,0 +1,167 @@
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+
+# column value of a row that doesn't have the key at all, as opposed to id 0 for a stored None
+ABSENT_ID = 2 ** 32 - 1
+_ABSENT = object()
+
+
+class StringPool:
+    """ Interned strings addressed by integer ids; id 0 stands for None """
+
+    def __init__(self) -> None:
+        self.strings = [None]
+        self.__ids = {}
+        self.performers = []
+        self.__performer_ids = {}
+
+    def add(self, s: str | None) -> int:
+        if s is None:
+            return 0
+        i = self.__ids.get(s)
+        if i is None:
+            i = self.__ids[s] = len(self.strings)
+            self.strings.append(sys.intern(s))
+        return i
+
+    def intern(self, s: str) -> str:
+        return self.strings[self.add(s)]
+
+    def add_performer(self, name: str, role: str) -> int:
+        key = (self.intern(name), self.intern(role))
+        i = self.__performer_ids.get(key)
+        if i is None:
+            i = self.__performer_ids[key] = len(self.performers)
+            self.performers.append(Performer(*key))
+        return i
+
+
+class Performer:
+    """ Immutable, shared performer record; supports dict-style access like the JSON it replaces """
+    __slots__ = ('name', 'role')
+
+    def __init__(self, name: str, role: str) -> None:
+        self.name = name
+        self.role = role
+
+    def __getitem__(self, key: str) -> str:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __repr__(self) -> str:
+        return f"Performer({self.name!r}, {self.role!r})"
+
+
+class PerformanceTable(Sequence):
+    """
+    Column-oriented storage for the performances of one work. String fields are stored as pool ids
+    in typed arrays, and performers as ids into the pool's shared Performer records. Rows are read
+    through PerformanceRow views, which behave like the original read-only dicts: stored None values
+    are kept, and keys a performance didn't have stay absent.
+    """
+    PERFORMERS_KEY = 'performers'
+
+    def __init__(self, performances: list, pool: StringPool) -> None:
+        self.pool = pool
+        keys = []
+        for performance in performances:
+            keys += [k for k in performance if k not in keys and k != self.PERFORMERS_KEY]
+        self.columns = {}
+        self.extra = {}
+        for key in keys:
+            values = [performance.get(key, _ABSENT) for performance in performances]
+            if all(v is None or v is _ABSENT or isinstance(v, str) for v in values):
+                self.columns[key] = array('I', [ABSENT_ID if v is _ABSENT else pool.add(v) for v in values])
+            else:
+                self.extra[key] = values
+        self.performer_offsets = array('I', [0])
+        self.performer_ids = array('I')
+        # rows without a performers list, or with a null one; both are rare, so sets beat a column
+        self.no_performers = set()
+        self.null_performers = set()
+        for i, performance in enumerate(performances):
+            performers = performance.get(self.PERFORMERS_KEY, _ABSENT)
+            if performers is _ABSENT:
+                self.no_performers.add(i)
+            elif performers is None:
+                self.null_performers.add(i)
+            else:
+                for performer in performers:
+                    self.performer_ids.append(pool.add_performer(performer['name'], performer['role']))
+            self.performer_offsets.append(len(self.performer_ids))
+        self.__len = len(performances)
+
+    def __len__(self) -> int:
+        return self.__len
+
+    def __getitem__(self, i: int) -> 'PerformanceRow':
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.__len))]
+        if i < 0:
+            i += self.__len
+        if not 0 <= i < self.__len:
+            raise IndexError(i)
+        return PerformanceRow(self, i)
+
+    def performers(self, i: int) -> list:
+        ids = self.performer_ids[self.performer_offsets[i]:self.performer_offsets[i + 1]]
+        return [self.pool.performers[j] for j in ids]
+
+
+class PerformanceRow(Mapping):
+    """ Read-only view of one row of a PerformanceTable """
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table: PerformanceTable, index: int) -> None:
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key: str) -> object:
+        table = self.table
+        if key in table.columns:
+            i = table.columns[key][self.index]
+            value = _ABSENT if i == ABSENT_ID else table.pool.strings[i]
+        elif key in table.extra:
+            value = table.extra[key][self.index]
+        elif key == table.PERFORMERS_KEY and self.index not in table.no_performers:
+            value = None if self.index in table.null_performers else table.performers(self.index)
+        else:
+            value = _ABSENT
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        return (k for k in [*self.table.columns, *self.table.extra, self.table.PERFORMERS_KEY] if k in self)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+
+def compact_works(works: list, pool: StringPool) -> list:
+    """ Replaces each work's performances with a PerformanceTable and interns its string fields, in place """
+    for work in works:
+        for key, value in work.items():
+            if isinstance(value, str):
+                work[key] = pool.intern(value)
+        work['performances'] = PerformanceTable(work['performances'] or [], pool)
+    return works
+
+
+def compact_recordings(recordings: list, pool: StringPool) -> list:
+    """ Replaces recording performers with shared Performer records, in place """
+    for recording in recordings:
+        performers = recording.get('performers')
+        if performers:
+            recording['performers'] = [pool.performers[pool.add_performer(p['name'], p['role'])] for p in performers]
+    return recordings
@@ -0,0 +1,187 @@
+import os
+import sys
+import queue
+import shutil
+import signal
+import subprocess
+import tempfile
+from time import perf_counter, sleep
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LibreOfficeConverter:
+    """
+    Headless LibreOffice. Each worker slot gets its own user profile, so instances can run side by side.
+    The profiles live in a temporary directory that exists while the converter is used as a context manager.
+    """
+    parallel = True
+
+    def __init__(self, binary: str | None = None) -> None:
+        self.binary = binary or shutil.which('soffice') or shutil.which('libreoffice')
+        if not self.binary:
+            raise FileNotFoundError("LibreOffice (soffice) was not found on PATH")
+        self.profiles = None
+
+    def __enter__(self) -> 'LibreOfficeConverter':
+        self.profiles = tempfile.mkdtemp(prefix='prettycv-lo-')
+        return self
+
+    def __exit__(self, *exc) -> None:
+        shutil.rmtree(self.profiles, ignore_errors=True)
+        self.profiles = None
+
+    def command(self, source: str, output_dir: str, slot: int) -> list:
+        profile = os.path.join(self.profiles, f'profile_{slot}')
+        return [self.binary, f'-env:UserInstallation=file://{profile}', '--headless',
+                '--convert-to', 'pdf', '--outdir', output_dir, source]
+
+
+class WordConverter:
+    """ docx2pdf, which drives Microsoft Word (macOS/Windows). Word handles one document at a time """
+    parallel = False
+    SCRIPT = 'import sys; from docx2pdf import convert; convert(sys.argv[1], sys.argv[2])'
+
+    def __enter__(self) -> 'WordConverter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def command(self, source: str, output_dir: str, slot: int) -> list:
+        output = os.path.join(output_dir, os.path.splitext(os.path.basename(source))[0] + '.pdf')
+        return [sys.executable, '-c', self.SCRIPT, source, output]
+
+
+def default_converter() -> LibreOfficeConverter | WordConverter:
+    return LibreOfficeConverter() if sys.platform.startswith('linux') else WordConverter()
+
+
+@dataclass
+class ConversionResult:
+    source: str
+    output: str
+    size: int
+    ok: bool = False
+    attempts: int = 0
+    latency: float = 0.0
+    error: str | None = None
+
+
+class ConversionReport:
+    def __init__(self, results: list, elapsed: float) -> None:
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.results)
+
+    @property
+    def throughput(self) -> float:
+        """ Converted files per second of wall time """
+        return sum(r.ok for r in self.results) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        lines = []
+        for r in self.results:
+            status = 'ok' if r.ok else 'FAILED'
+            retries = f' ({r.attempts} attempts)' if r.attempts > 1 else ''
+            error = f': {r.error}' if r.error else ''
+            lines.append(f"{status:>6} {r.latency:7.2f}s  {r.source} -> {r.output}{retries}{error}")
+        n_ok = sum(r.ok for r in self.results)
+        megabytes = sum(r.size for r in self.results if r.ok) / 1e6
+        lines.append(f"{n_ok}/{len(self.results)} converted in {self.elapsed:.2f}s "
+                     f"({self.throughput:.2f} files/s, {megabytes / self.elapsed if self.elapsed else 0:.2f} MB/s)")
+        return '\n'.join(lines)
+
+
+class ConversionScheduler:
+    """
+    Converts batches of DOCX files to PDF on a bounded set of workers. The largest documents are
+    scheduled first, failed conversions are retried, each attempt is killed after `timeout` seconds,
+    and outputs are written to a temporary directory and moved into place, so a PDF is never half-written.
+    """
+
+    def __init__(self, workers: int | None = None, retries: int = 2, timeout: float = 120.0,
+                 converter: LibreOfficeConverter | WordConverter | None = None) -> None:
+        self.converter = converter or default_converter()
+        self.workers = (workers or os.cpu_count() or 1) if self.converter.parallel else 1
+        self.retries = retries
+        self.timeout = timeout
+
+    def run(self, jobs: list) -> ConversionReport:
+        """ jobs: DOCX paths, or (docx, pdf) pairs. Outputs default to the source path with a .pdf suffix """
+        results = []
+        for job in jobs:
+            source, output = job if isinstance(job, (tuple, list)) else (job, os.path.splitext(job)[0] + '.pdf')
+            results.append(ConversionResult(source, output, os.path.getsize(source)))
+        slots = queue.Queue()
+        for slot in range(self.workers):
+            slots.put(slot)
+
+        def convert(result: ConversionResult) -> ConversionResult:
+            slot = slots.get()
+            try:
+                self.__convert(result, slot)
+            finally:
+                slots.put(slot)
+            return result
+
+        start = perf_counter()
+        with self.converter, ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(convert, sorted(results, key=lambda r: r.size, reverse=True)))
+        return ConversionReport(results, perf_counter() - start)
+
+    def __convert(self, result: ConversionResult, slot: int) -> None:
+        output_dir = os.path.dirname(os.path.abspath(result.output))
+        start = perf_counter()
+        while result.attempts <= self.retries and not result.ok:
+            result.attempts += 1
+            tmp_dir = tempfile.mkdtemp(prefix='.convert-', dir=output_dir)
+            try:
+                self.__execute(self.converter.command(os.path.abspath(result.source), tmp_dir, slot))
+                produced = os.path.join(tmp_dir, os.path.splitext(os.path.basename(result.source))[0] + '.pdf')
+                if not os.path.exists(produced):
+                    raise RuntimeError("converter exited without producing a PDF")
+                os.replace(produced, result.output)
+                result.ok, result.error = True, None
+            except subprocess.TimeoutExpired:
+                result.error = f"timed out after {self.timeout:g}s"
+            except (OSError, RuntimeError, subprocess.SubprocessError) as e:
+                result.error = str(e) or type(e).__name__
+                if result.attempts <= self.retries:
+                    sleep(0.5 * result.attempts)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        result.latency = perf_counter() - start
+
+    def __execute(self, cmd: list) -> None:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True)
+        try:
+            _, err = proc.communicate(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            # kill the whole session, since soffice forks its worker process
+            if hasattr(os, 'killpg'):
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+            proc.communicate()
+            raise
+        if proc.returncode != 0:
+            raise RuntimeError(err.decode(errors='replace').strip() or f"exit status {proc.returncode}")
+
+
+def convert_all(paths: list, workers: int | None = None) -> ConversionReport:
+    """ Converts DOCX files to PDFs next to them, raising if any conversion fails """
+    report = ConversionScheduler(workers=workers).run(paths)
+    if not report.ok:
+        raise RuntimeError(f"PDF conversion failed:\n{report.summary()}")
+    return report
+
+
+if __name__ == '__main__':
+    # Usage: python convert.py a.docx b.docx ...
+    report = ConversionScheduler().run(sys.argv[1:])
+    print(report.summary())
+    sys.exit(0 if report.ok else 1)
@@ -1,26 +1,20 @@
 import os
-import json
 import subprocess
-from docx import Document
 from time import sleep
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.table import _Cell
-from docx.text.paragraph import Paragraph, Parented
-from docx.shared import Pt, Inches
+from collections import defaultdict
 from collections.abc import Callable
+import ir
+from ir import Cell, Paragraph, BLUE, DARK_BLUE, GRAY, LIGHT_GRAY
+from volumes import build, write_volumes
+from convert import convert_all
+from catalog import PERFORMANCE_FILTERS, WorksCatalog
+from compact import StringPool, compact_works, compact_recordings
+from sources import SourceCache
+from memory import MemoryTracker
 from utils import (
-    insertHR,
     format_date_range,
-    add_hyperlink,
     format_year_range,
     parse_date,
-    indent_table,
-    add_page_number,
-    BLUE,
-    DARK_BLUE,
-    GRAY,
-    LIGHT_GRAY,
-    BLACK
 )
 
 
@@ -28,77 +22,134 @@ class CV:
     """ Curriculum Vitae class """
     CV_KEY = 'cv'
     WORKS_KEY = 'works'
-
-    def __init__(self, font: str = 'Lato', reverse_format: bool = False) -> None:
-        self.doc = Document()
+    # CV keys each section reads, released once it is rendered in low-memory mode
+    SECTION_SOURCES = {
+        'basics': ['basics'],
+        'publications': ['work'],
+        'awards': ['awards'],
+    }
+
+    def __init__(self, font: str = 'Lato', reverse_format: bool = False, works_filter: dict | None = None,
+                 memory_budget: int | None = None, memory_mode: str = 'raise', track_memory: bool = False) -> None:
+        self.doc = ir.Document()
         self.font = font
         self.font_size = 10.5
-        self.tab_size = Inches(0.3)
-        self.date_col_width = Inches(0.95)
-        self.item_col_width = Inches(5.25)
+        self.tab_size = 0.3
+        self.date_col_width = 0.95
+        self.item_col_width = 5.25
         self.reverse_format = reverse_format
-        for style_name in ['Normal'] + [f'Heading {i}' for i in range(1, 6)]:
-            style = self.doc.styles[style_name]
-            style.font.name = self.font
-            style.font.size = Pt(self.font_size)
-            style.font.color.rgb = BLACK
-            style.paragraph_format.space_after = Pt(0)
-            style.paragraph_format.space_before = Pt(0)
-
-    def write(self, output_file: str, open_file: bool = True) -> None:
-        self.doc.save(output_file)
+        # keyword arguments for WorksCatalog.query, e.g. {'since': 2018} or {'country': 'Mexico'};
+        # performance filters also restrict the performances listed under each work
+        self.works_filter = works_filter or {}
+        # with a memory budget (in bytes) or track_memory=True, allocations are traced per stage from
+        # load_data through write; see memory.MemoryTracker and self.memory.report()
+        self.memory = MemoryTracker(memory_budget, memory_mode, track_memory)
+
+    def write(self, output_file: str, open_file: bool = True, split_by: str | None = None, budget: int | None = None,
+              pdf: bool = False, workers: int | None = None) -> None:
+        """
+        Emits the compiled document; the output format is inferred from the file extension.
+        With split_by ('section', 'works' or 'pages', see volumes.split), volumes are written next to
+        output_file in parallel, and output_file becomes an index linking them.
+        """
+        if self.memory.low_memory:
+            # only the compiled document is needed from here on
+            self.data, self.catalog = {}, None
+        with self.memory.stage('write'):
+            if split_by:
+                write_volumes(self.doc, output_file, split_by, budget, self.font, self.font_size,
+                              pdf=pdf, workers=workers)
+            else:
+                if pdf and not output_file.lower().endswith('.docx'):
+                    raise ValueError("PDF conversion requires DOCX output")
+                build(self.doc, output_file, self.font, self.font_size)
+                if pdf:
+                    convert_all([output_file])
+        self.memory.stop()
         if open_file:
             cmd = """osascript -e 'tell application "Microsoft Word" to close windows'"""
             os.system(cmd)
             sleep(1)
             subprocess.run(['open', output_file])
 
-    def load_data(self, cv_path: str, works_path: str) -> None:
-        data = {}
-        for json_file, key in zip([cv_path, works_path], [self.CV_KEY, self.WORKS_KEY]):
-            with open(json_file, 'r') as f:
-                data[key] = json.load(f)
-        self.data = data
-
-    def compile(self) -> None:
+    def save_ir(self, path: str) -> None:
+        ir.dump(self.doc, path)
+
+    def load_ir(self, path: str) -> None:
+        self.doc = ir.load(path)
+
+    def load_data(self, cv_path: str, works_path: str, compact: bool = False, cache: SourceCache | None = None) -> None:
+        """
+        Loads the CV and works catalog from local paths or URLs. URLs are fetched concurrently through
+        a SourceCache, which skips downloading and parsing files that haven't changed.
+        With compact=True, performance histories are stored in array-backed tables with interned
+        strings and shared performer records (see compact.py), which cuts memory for large catalogs.
+        Compact storage is also used when loading goes over the memory budget in 'degrade' mode.
+        """
+        self.memory.start()
+        with self.memory.stage('load_data'):
+            cache = cache or SourceCache()
+            data = dict(zip([self.CV_KEY, self.WORKS_KEY], cache.load([cv_path, works_path])))
+        with self.memory.stage('index'):
+            if compact or self.memory.low_memory:
+                pool = StringPool()
+                compact_works(data[self.WORKS_KEY], pool)
+                publications = data[self.CV_KEY]['work'].get('publications') or {}
+                compact_recordings(publications.get('recordings') or [], pool)
+            self.data = data
+            self.catalog = WorksCatalog(data[self.WORKS_KEY])
+
+    def compile(self) -> ir.Document:
+        self.doc = ir.Document()
         self.__apply_formatting()
-        self.__parse_basics()
-        self.__parse_education()
-        self.__parse_experience()
-        self.__parse_publications()
-        self.__parse_awards()
-        self.__parse_skills()
-        self.__parse_works()
+        sections = [
+            ('basics', self.__parse_basics),
+            ('education', self.__parse_education),
+            ('experience', self.__parse_experience),
+            ('publications', self.__parse_publications),
+            ('awards', self.__parse_awards),
+            ('skills', self.__parse_skills),
+            ('works', self.__parse_works),
+        ]
+        for name, parse in sections:
+            with self.memory.stage(name):
+                parse()
+            self.__release(name)
+        return self.doc
+
+    def __release(self, section: str) -> None:
+        """ In low-memory mode, drops the source data of a rendered section """
+        if not self.memory.low_memory:
+            return
+        for key in self.SECTION_SOURCES.get(section, []):
+            self.data[self.CV_KEY].pop(key, None)
+        if section == 'works':
+            self.data[self.WORKS_KEY] = []
+            self.catalog = None
 
     def __new_section(self, name: str) -> Paragraph:
         self.__insert_break(2)
-        header = self.doc.add_heading(name)
-        header.runs[0].font.name = self.font
-        insertHR(header)
-        return header
+        return self.doc.add_heading(name, rule=True)
 
     def __new_subsection(self, name: str) -> Paragraph:
         self.__insert_break()
         subheader = self.doc.add_heading(name, level=2)
-        font = subheader.runs[0].font
-        font.name = self.font
-        font.color.rgb = DARK_BLUE
+        subheader.spans[0].color = DARK_BLUE
         self.__insert_break()
         return subheader
 
-    def __insert_break(self, n_units: int | float = 1, parent: Parented | None = None):
+    def __insert_break(self, n_units: int | float = 1, parent: Cell | None = None):
         obj = parent or self.doc
-        gap = Pt(7 * n_units)
-        p = obj.add_paragraph(" ")
-        p.runs[0].font.size = gap
-        p.paragraph_format.line_spacing = gap
+        obj.add_break(7 * n_units)
 
     def __make_entry_table(self, parent: object, items: list, handler: Callable, date_getter: Callable) -> None:
         tbl = parent.add_table(len(items), 2)
+        tbl.kind, tbl.label_column = 'entries', int(self.reverse_format)
+        tbl.widths[int(self.reverse_format)] = self.date_col_width
+        tbl.widths[1-int(self.reverse_format)] = self.item_col_width
         last_date = None
         for i, item in enumerate(items):
             date_cell, item_cell = tbl.cell(i, int(self.reverse_format)), tbl.cell(i, 1-int(self.reverse_format))
-            date_cell.width, item_cell.width = self.date_col_width, self.item_col_width
             date = date_getter(item)
             if date != last_date:
                 date_cell.paragraphs[0].add_run(date)
@@ -113,8 +164,7 @@ class CV:
     def __parse_personal_info(self) -> None:
         basics = self.data[self.CV_KEY]['basics']
 
-        p = self.doc.add_paragraph("")
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        p = self.doc.add_paragraph("", align='center')
 
         name = p.add_run(basics['name'].upper())
         name.bold = True
@@ -136,41 +186,26 @@ class CV:
 
         _url = basics['profiles'][-1]['url']
         p.add_run(f"\n")
-        add_hyperlink(p, _url, _url)
+        p.add_link(_url, _url)
         p.add_run(f" | ")
-        add_hyperlink(p, basics['email'], basics['email'])
+        p.add_link(basics['email'], basics['email'])
 
     def __apply_formatting(self) -> None:
         basics = self.data[self.CV_KEY]['basics']
-        self.doc.settings.odd_and_even_pages_header_footer = True
-        self.doc.sections[0].different_first_page_header_footer = True
-        for i, attr in enumerate(['header', 'even_page_header']):
-            p = getattr(self.doc.sections[0], attr).paragraphs[0]
-            tab = '\t\t'
-            header = p.add_run(f"{[tab, ''][i]}{basics['name'].upper()}")
-            header.bold = True
-            suffix = p.add_run(' | Curriculum Vitae')
-            for x in [header, suffix]:
-                x.font.color.rgb = LIGHT_GRAY
-        self.doc.sections[0].first_page_header.paragraphs[0].text = ''
-        for i, attr in enumerate(['footer', 'even_page_footer']):
-            p = getattr(self.doc.sections[0], attr).paragraphs[0]
-            add_page_number(p.add_run())
-            p.runs[0].font.color.rgb = LIGHT_GRAY
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        header = ir.Span(basics['name'].upper(), bold=True, color=LIGHT_GRAY)
+        suffix = ir.Span(' | Curriculum Vitae', color=LIGHT_GRAY)
+        self.doc.header = [header, suffix]
 
     def __parse_interests(self) -> None:
         self.__insert_break(2)
         interests = [x.lower() if x[1].islower() else x for x in self.data[self.CV_KEY]['basics']['interests']]
         interests.sort()
-        p = self.doc.add_paragraph("Interests: ")
-        p.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-        p.runs[0].bold = True
-        f = p.paragraph_format
-        f.left_indent = self.tab_size * 2
-        f.right_indent = self.tab_size * 2
+        p = self.doc.add_paragraph("Interests: ", align='justify')
+        p.spans[0].bold = True
+        p.left_indent = self.tab_size * 2
+        p.right_indent = self.tab_size * 2
         keywords = p.add_run(f'{" • ".join(interests)}.')
-        keywords.font.color.rgb = GRAY
+        keywords.color = GRAY
 
     def __parse_education(self) -> None:
         education = self.data[self.CV_KEY].pop('education', None)
@@ -187,8 +222,7 @@ class CV:
 
                 p.add_run(f", {degree['major']}.")
 
-                p = self.doc.add_paragraph()
-                p.paragraph_format.left_indent = self.tab_size
+                p = self.doc.add_paragraph(left_indent=self.tab_size)
 
                 institution = p.add_run(f"{degree['institution']}")
                 institution.bold = True
@@ -197,7 +231,7 @@ class CV:
                 minors = degree['minors']
                 if minors:
                     minors_label = p.add_run("\nMinor fields: ")
-                    minors_label.font.bold = True
+                    minors_label.bold = True
                     p.add_run(f"{', '.join(degree['minors'])}.")
                 highlights = degree['highlights']
                 if highlights:
@@ -210,9 +244,7 @@ class CV:
         if other_ed:
             self.__new_subsection("Other")
             for ed in other_ed:
-                p = self.doc.add_paragraph("")
-                p.paragraph_format.left_indent = self.tab_size
-                p.paragraph_format.first_line_indent = -self.tab_size
+                p = self.doc.add_paragraph("", left_indent=self.tab_size, first_line_indent=-self.tab_size)
 
                 name = p.add_run(ed['name'])
                 name.bold = True
@@ -225,7 +257,7 @@ class CV:
         self.__parse_residencies()
 
     def __parse_jobs(self) -> None:
-        def handler(cell: _Cell, item: dict) -> _Cell:
+        def handler(cell: Cell, item: dict) -> Cell:
             position = item
             p = cell.paragraphs[0]
             name = p.add_run(position['name'])
@@ -236,17 +268,18 @@ class CV:
             _courses = position.pop('courses', None)
             if _courses:
                 course_tbl = cell.add_table(len(_courses), 2)
+                course_tbl.kind = 'labelled'
+                course_tbl.widths[1] = 20
                 course_label_cell = course_tbl.cell(0, 0)
                 course_label_cell.paragraphs[0].add_run("Courses:")
 
                 for j, course in enumerate(_courses):
                     course_cell = course_tbl.cell(j, 1)
-                    course_cell.width = Inches(20)
                     cp = course_cell.paragraphs[0]
                     course_name = cp.add_run(course['name'])
-                    course_name.font.bold = True
+                    course_name.bold = True
                     terms = cp.add_run(", {}.".format(course['terms']))
-                    terms.font.color.rgb = GRAY
+                    terms.color = GRAY
                 return course_cell
 
         def date_getter(item: dict) -> str:
@@ -277,11 +310,10 @@ class CV:
             name.italic = True
 
             for event in lecture['events']:
-                p = self.doc.add_paragraph("@ ")
-                p.runs[0].font.color.rgb = BLUE
-                p.paragraph_format.left_indent = self.tab_size
+                p = self.doc.add_paragraph("@ ", left_indent=self.tab_size)
+                p.spans[0].color = BLUE
                 event_name = p.add_run(event['name'])
-                event_name.font.italic = True
+                event_name.italic = True
                 year, month, day = parse_date(event['date'])
                 p.add_run(f". { event['venue']}. {event['city']}. {event['country']}. {f'{month} {day}, {year}'}.")
 
@@ -299,9 +331,8 @@ class CV:
             name.italic = True
 
             for event in workshop['events']:
-                p = self.doc.add_paragraph("@ ")
-                p.runs[0].font.color.rgb = BLUE
-                p.paragraph_format.left_indent = self.tab_size
+                p = self.doc.add_paragraph("@ ", left_indent=self.tab_size)
+                p.spans[0].color = BLUE
                 institution = p.add_run(event['institution'])
                 institution.italic = True
                 year, month, day = parse_date(event['date'])
@@ -317,28 +348,27 @@ class CV:
         def date_getter(item: dict) -> str:
             return parse_date(item['date'])[0]
 
-        def handler(cell: _Cell, item: dict) -> None:
+        def handler(cell: Cell, item: dict) -> None:
             residency = item
             p = cell.paragraphs[0]
             role = p.add_run(residency['role'])
-            role.font.italic = True
+            role.italic = True
             at = p.add_run(" @ ")
-            at.font.color.rgb = BLUE
+            at.color = BLUE
             event = p.add_run(residency['event'])
-            event.font.bold = True
+            event.bold = True
 
             _institution = residency['institution']
             _end = residency['end']
             date_range = format_date_range(residency['date'], _end)
             p.add_run(f". {_institution}. {date_range}.")
 
-            p = cell.add_paragraph()
-            p.paragraph_format.left_indent = self.tab_size
+            p = cell.add_paragraph(left_indent=self.tab_size)
             label = p.add_run("Activities: ")
-            label.font.bold = True
+            label.bold = True
             _activities = "{}.".format(", ".join(residency['activities']))
             activities = p.add_run(_activities)
-            activities.font.italic = True
+            activities.italic = True
 
         self.__new_subsection("Residencies")
         residencies.sort(key=lambda x: x['date'], reverse=True)
@@ -346,16 +376,9 @@ class CV:
 
     def __parse_awards(self) -> None:
         self.__new_section("AWARDS")
-        awards = []
-        commissions = []
-        for work in self.data[self.WORKS_KEY]:
-            work_awards = work['awards']
-            commission = work['commission']
-            if work_awards:
-                for award in work_awards:
-                    awards.append(award)
-            if commission:
-                commissions.append(work)
+        awards = [award for work in self.catalog.query(**{**self.works_filter, 'awarded': True, 'sort': None})
+                  for award in work['awards']]
+        commissions = self.catalog.query(**{**self.works_filter, 'commissioned': True})
 
         self.___parse_awards(awards, "Artistic awards")
         self.___parse_commissions(commissions)
@@ -365,14 +388,14 @@ class CV:
         if not commissions:
             return
 
-        def handler(cell: _Cell, item: dict) -> None:
+        def handler(cell: Cell, item: dict) -> None:
             commission = item
             p = cell.paragraphs[0]
             name = p.add_run(commission['name'])
-            name.font.bold = True
+            name.bold = True
 
             subtitle = p.add_run(" {}.".format(commission['subtitle']))
-            subtitle.font.italic = True
+            subtitle.italic = True
 
             p.add_run(" {}.".format(commission['commission']))
 
@@ -380,18 +403,17 @@ class CV:
             return str(item['year'])
 
         self.__new_subsection("Commissions")
-        commissions.sort(key=lambda x: x['year'], reverse=True)
         self.__make_entry_table(self.doc, commissions, handler, date_getter)
 
     def ___parse_awards(self, awards: dict, label: str) -> None:
         if not awards:
             return
 
-        def handler(cell: _Cell, item: dict) -> None:
+        def handler(cell: Cell, item: dict) -> None:
             award = item
             p = cell.paragraphs[0]
             name = p.add_run(award['name'])
-            name.font.bold = True
+            name.bold = True
 
             p.add_run(". {}. {}.".format(*[award[x] for x in ['institution', 'country']]))
 
@@ -405,23 +427,23 @@ class CV:
     def __parse_publications(self) -> None:
         publications = self.data[self.CV_KEY]['work'].pop('publications', None)
         if publications:
-            def handler(cell: _Cell, item: dict) -> None:
+            def handler(cell: Cell, item: dict) -> None:
                 pub = item
                 p = cell.paragraphs[0]
                 p.add_run(f"{pub['author']} ({pub['date']}). ")
                 name = p.add_run(pub['name'])
-                name.font.bold = True
+                name.bold = True
 
                 publisher = p.add_run(f". {pub['publisher']}")
-                publisher.font.italic = True
+                publisher.italic = True
                 if pub["pages"]:
                     p.add_run(f", ({pub['edition']}), {'-'.join([str(x) for x in pub['pages']])}. ")
-                    add_hyperlink(p, pub['doi'], pub['doi'])
+                    p.add_link(pub['doi'], pub['doi'])
 
             def date_getter(item: dict) -> str:
                 return str(item['date'])
 
-            def recording_handler(cell: _Cell, item: dict) -> None:
+            def recording_handler(cell: Cell, item: dict) -> None:
                 rec = item
                 p = cell.paragraphs[0]
                 album = p.add_run(f"{rec['album']}. ")
@@ -455,28 +477,26 @@ class CV:
 
         software_list = self.data[self.CV_KEY]['work'].pop('software', None)
         if software_list:
-            def handler(cell: _Cell, item: dict) -> None:
+            def handler(cell: Cell, item: dict) -> None:
                 software = item
                 p = cell.paragraphs[0]
                 name = p.add_run(software['name'])
-                name.font.bold = True
+                name.bold = True
 
                 url = software['url']
                 p.add_run(" (")
-                add_hyperlink(p, url, url)
+                p.add_link(url, url)
                 p.add_run(")")
 
-                p = cell.add_paragraph("Keywords: ")
-                p.runs[0].italic = p.runs[0].bold = True
-                p.paragraph_format.left_indent = self.tab_size
+                p = cell.add_paragraph("Keywords: ", left_indent=self.tab_size)
+                p.spans[0].italic = p.spans[0].bold = True
                 keywords = p.add_run(f'{", ".join(software["keywords"])}.')
                 keywords.italic = True
 
-                p = cell.add_paragraph("Description: ")
-                p.runs[0].italic = p.runs[0].bold = True
-                p.paragraph_format.left_indent = self.tab_size
+                p = cell.add_paragraph("Description: ", left_indent=self.tab_size)
+                p.spans[0].italic = p.spans[0].bold = True
                 descr = p.add_run(f"{software['description']}")
-                descr.font.italic = True
+                descr.italic = True
 
             def date_getter(item: dict) -> str:
                 return str(item['year'])
@@ -495,8 +515,8 @@ class CV:
             self.__new_subsection(skill_key.capitalize())
             skills = skills_dict[skill_key]
             skills.sort(key=lambda x: x['level'])
-            tbl = self.doc.add_table(round(len(skills) / divs), divs)
-            indent_table(tbl, 350)
+            tbl = self.doc.add_table(-(-len(skills) // divs), divs)
+            tbl.indent = 350 / 1440
             for i, skill in enumerate(skills):
                 row = i // divs
                 col = i % divs
@@ -505,34 +525,43 @@ class CV:
                 p = cell.paragraphs[0]
 
                 name = p.add_run(skill['name'])
-                name.font.bold = True
+                name.bold = True
 
                 keywords = p.add_run(f' ({", ".join(skill["keywords"])})')
-                keywords.font.italic = True
-
-                gap = Pt(5)
+                keywords.italic = True
 
-                p = cell.add_paragraph(" ")
-                p.runs[0].font.size = gap
-                p.paragraph_format.line_spacing = gap
+                cell.add_break(5)
             self.__insert_break()
 
     def __parse_works(self) -> None:
-        works = self.data[self.WORKS_KEY]
+        works = self.catalog.query(**self.works_filter)
         if not works:
             return
+        perf_filter = {arg: self.works_filter[key] for key, arg in PERFORMANCE_FILTERS.items()
+                       if self.works_filter.get(key) is not None}
+        matched = None
+        if perf_filter:
+            matched = defaultdict(list)
+            for work, performance in self.catalog.performances(**perf_filter):
+                matched[id(work)].append(performance)
+        if self.memory.low_memory:
+            # the index holds references to every performance; the query result is all that's needed
+            self.catalog = None
         self.doc.add_page_break()
         self.__new_section("LIST OF WORKS")
-        works.sort(key=lambda x: x['year'], reverse=True)
         last_date = None
         for i, work in enumerate(works):
+            self.memory.check('works')
+            if self.memory.low_memory and i:
+                works[i - 1].clear()
+            self.doc.add_marker('work')
             date = str(work['year'])
             if date != last_date:
                 self.__new_subsection(f"{date}")
             last_date = date
             p = self.doc.add_paragraph()
             name = p.add_run(work['name'])
-            name.font.bold = True
+            name.bold = True
 
             p.add_run(f" ({date}) ")
             subtitle = p.add_run(f"{work['subtitle']}. ")
@@ -543,45 +572,42 @@ class CV:
             _commission = work['commission']
             if _commission:
                 self.__insert_break(0.5)
-                p = self.doc.add_paragraph()
-                p.paragraph_format.left_indent = self.tab_size
+                p = self.doc.add_paragraph(left_indent=self.tab_size)
                 commission = p.add_run(f'{_commission}.')
                 commission.italic = True
-                commission.font.color.rgb = GRAY
+                commission.color = GRAY
 
-            performances = work['performances']
+            performances = work['performances'] if matched is None else matched[id(work)]
             if performances:
-                performances.sort(key=lambda x: x['date'], reverse=True)
+                premiere_date = min(x['date'] for x in work['performances'])
+                performances = sorted(performances, key=lambda x: x['date'], reverse=True)
                 num_perf = len(performances)
                 self.__insert_break(0.5)
-                p = self.doc.add_paragraph("Performances")
-                label = p.runs[0]
+                p = self.doc.add_paragraph("Performances", left_indent=self.tab_size)
+                label = p.spans[0]
                 label.italic = True
                 label.bold = True
-                label.font.color.rgb = DARK_BLUE
-                p.paragraph_format.left_indent = self.tab_size
+                label.color = DARK_BLUE
                 self.__insert_break(0.5)
                 for i, performance in enumerate(performances):
-                    p = self.doc.add_paragraph()
-                    p.paragraph_format.left_indent = self.tab_size
+                    p = self.doc.add_paragraph(left_indent=self.tab_size)
 
                     event = p.add_run(performance['event'])
-                    event.font.bold = True
+                    event.bold = True
 
-                    if i == num_perf - 1:
+                    if i == num_perf - 1 and performance['date'] == premiere_date:
                         p.add_run(" (world premiere)")
 
                     at = p.add_run(" @ ")
-                    at.font.color.rgb = BLUE
+                    at.color = BLUE
 
                     year, month, day = parse_date(performance['date'])
                     p.add_run(
                         f"{performance['venue']}. {performance['city']}. {performance['country']}. {month} {day}, {year}. ")
 
-                    performers = performance.pop('performers', None)
+                    performers = performance.get('performers')
                     if performers:
-                        p = self.doc.add_paragraph("Performed by ")
-                        p.paragraph_format.left_indent = self.tab_size * 2
+                        p = self.doc.add_paragraph("Performed by ", left_indent=self.tab_size * 2)
                         num_performers = len(performers)
                         for i, performer in enumerate(performers):
                             p.add_run(performer['name'])
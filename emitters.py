@@ -0,0 +1,316 @@
+import os
+from html import escape
+from ir import (
+    Document,
+    Paragraph,
+    Heading,
+    Span,
+    Link,
+    Break,
+    PageBreak,
+    Table,
+    Cell,
+    BLUE,
+    LIGHT_GRAY,
+)
+
+
+class Emitter:
+    """ Base class for serializers of the intermediate representation """
+    extension = None
+
+    def __init__(self, font: str = 'Lato', font_size: float = 10.5) -> None:
+        self.font = font
+        self.font_size = font_size
+
+    def write(self, document: Document, output_file: str) -> None:
+        raise NotImplementedError
+
+
+class DocxEmitter(Emitter):
+    """ Emits a python-docx document. python-docx is only imported when this emitter is used """
+    extension = '.docx'
+
+    def write(self, document: Document, output_file: str) -> None:
+        self.render(document).save(output_file)
+
+    def render(self, document: Document) -> object:
+        from docx import Document as DocxDocument
+        from docx.shared import Pt
+        from utils import BLACK
+
+        doc = DocxDocument()
+        for style_name in ['Normal'] + [f'Heading {i}' for i in range(1, 6)]:
+            style = doc.styles[style_name]
+            style.font.name = self.font
+            style.font.size = Pt(self.font_size)
+            style.font.color.rgb = BLACK
+            style.paragraph_format.space_after = Pt(0)
+            style.paragraph_format.space_before = Pt(0)
+        self.__apply_formatting(doc, document)
+        for block in document.blocks:
+            self.__add_block(doc, block)
+        return doc
+
+    def __apply_formatting(self, doc: object, document: Document) -> None:
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.shared import RGBColor
+        from utils import add_page_number
+
+        if not document.header:
+            return
+        doc.settings.odd_and_even_pages_header_footer = True
+        doc.sections[0].different_first_page_header_footer = True
+        header = list(document.header)
+        if document.volume:
+            header.append(Span(f' | {document.volume}', color=header[-1].color))
+        for i, attr in enumerate(['header', 'even_page_header']):
+            p = getattr(doc.sections[0], attr).paragraphs[0]
+            tab = '\t\t'
+            for j, span in enumerate(header):
+                prefix = [tab, ''][i] if j == 0 else ''
+                self.__add_span(p, Span(prefix + span.text, span.bold, span.italic, span.color, span.size))
+        doc.sections[0].first_page_header.paragraphs[0].text = ''
+        for attr in ['footer', 'even_page_footer']:
+            p = getattr(doc.sections[0], attr).paragraphs[0]
+            if document.volume:
+                p.add_run(f'{document.volume} – ')
+            add_page_number(p.add_run())
+            for run in p.runs:
+                run.font.color.rgb = RGBColor.from_string(LIGHT_GRAY)
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    def __add_block(self, parent: object, block: object, p: object | None = None) -> None:
+        from docx.shared import Pt, Inches
+        from utils import insertHR, indent_table
+
+        if isinstance(block, Heading):
+            p = parent.add_heading('', level=block.level)
+            self.__fill_paragraph(p, block)
+            for run in p.runs:
+                run.font.name = self.font
+            if block.rule:
+                insertHR(p)
+        elif isinstance(block, Paragraph):
+            self.__fill_paragraph(p or parent.add_paragraph(), block)
+        elif isinstance(block, Break):
+            p = parent.add_paragraph(" ")
+            gap = Pt(block.size)
+            p.runs[0].font.size = gap
+            p.paragraph_format.line_spacing = gap
+        elif isinstance(block, PageBreak):
+            parent.add_page_break()
+        elif isinstance(block, Table):
+            tbl = parent.add_table(len(block.rows), len(block.widths))
+            if block.indent:
+                indent_table(tbl, round(block.indent * 1440))
+            for i, row in enumerate(block.rows):
+                for j, cell in enumerate(row):
+                    docx_cell = tbl.cell(i, j)
+                    if block.widths[j] is not None:
+                        docx_cell.width = Inches(block.widths[j])
+                    self.__fill_cell(docx_cell, cell)
+
+    def __fill_cell(self, docx_cell: object, cell: Cell) -> None:
+        for i, block in enumerate(cell.blocks):
+            # docx cells already contain an empty paragraph, which the first IR paragraph reuses
+            first = docx_cell.paragraphs[0] if i == 0 and type(block) is Paragraph else None
+            self.__add_block(docx_cell, block, p=first)
+
+    def __fill_paragraph(self, p: object, block: Paragraph) -> None:
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.shared import Inches
+
+        if block.align:
+            p.alignment = getattr(WD_ALIGN_PARAGRAPH, block.align.upper())
+        f = p.paragraph_format
+        if block.left_indent:
+            f.left_indent = Inches(block.left_indent)
+        if block.right_indent:
+            f.right_indent = Inches(block.right_indent)
+        if block.first_line_indent:
+            f.first_line_indent = Inches(block.first_line_indent)
+        for span in block.spans:
+            self.__add_span(p, span)
+
+    def __add_span(self, p: object, span: Span | Link) -> None:
+        from docx.shared import Pt, RGBColor
+        from utils import add_hyperlink
+
+        if isinstance(span, Link):
+            add_hyperlink(p, span.text, span.url)
+            return
+        run = p.add_run(span.text)
+        if span.bold:
+            run.bold = True
+        if span.italic:
+            run.italic = True
+        if span.color:
+            run.font.color.rgb = RGBColor.from_string(span.color)
+        if span.size:
+            run.font.size = Pt(span.size)
+
+
+class HTMLEmitter(Emitter):
+    """ Emits a standalone HTML page """
+    extension = '.html'
+
+    def write(self, document: Document, output_file: str) -> None:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(self.render(document))
+
+    def render(self, document: Document) -> str:
+        title = escape(''.join(s.text for s in document.header) + (f' | {document.volume}' if document.volume else ''))
+        body = ''.join(self.__block(b) for b in document.blocks)
+        return (
+            '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            f'<title>{title}</title>\n'
+            '<style>\n'
+            f'body {{ font-family: "{self.font}", sans-serif; font-size: {self.font_size}pt; '
+            'max-width: 6.5in; margin: 1in auto; }\n'
+            'h1, h2, p { margin: 0; font-size: inherit; }\n'
+            '.rule { border-bottom: 1px solid; }\n'
+            'table { border-collapse: collapse; width: 100%; }\n'
+            'td { vertical-align: top; padding: 0; }\n'
+            f'a {{ color: #{BLUE}; }}\n'
+            '</style>\n</head>\n'
+            f'<body>\n{body}</body>\n</html>\n'
+        )
+
+    def __block(self, block: object) -> str:
+        if isinstance(block, Heading):
+            attr = ' class="rule"' if block.rule else ''
+            return f'<h{block.level}{attr}>{self.__spans(block.spans)}</h{block.level}>\n'
+        if isinstance(block, Paragraph):
+            return f'<p{self.__paragraph_style(block)}>{self.__spans(block.spans)}</p>\n'
+        if isinstance(block, Break):
+            return f'<div style="height: {block.size:g}pt"></div>\n'
+        if isinstance(block, PageBreak):
+            return '<div style="break-after: page"></div>\n'
+        if isinstance(block, Table):
+            style = f' style="margin-left: {block.indent:g}in"' if block.indent else ''
+            widths = self.__column_widths(block.widths)
+            rows = []
+            for row in block.rows:
+                cells = []
+                for j, cell in enumerate(row):
+                    attr = f' style="width: {widths[j]}"' if widths[j] else ''
+                    cells.append(f'<td{attr}>{"".join(self.__block(b) for b in cell.blocks)}</td>')
+                rows.append(f'<tr>{"".join(cells)}</tr>\n')
+            return f'<table{style}>\n{"".join(rows)}</table>\n'
+        return ''
+
+    @staticmethod
+    def __column_widths(widths: list) -> list:
+        # relative widths when fully specified; otherwise sized columns absorb the remaining space, as in Word
+        if None not in widths:
+            total = sum(widths)
+            return [f'{100 * w / total:.1f}%' for w in widths]
+        return ['100%' if w else None for w in widths]
+
+    def __paragraph_style(self, block: Paragraph) -> str:
+        rules = []
+        if block.align:
+            rules.append(f'text-align: {block.align}')
+        if block.left_indent:
+            rules.append(f'margin-left: {block.left_indent:g}in')
+        if block.right_indent:
+            rules.append(f'margin-right: {block.right_indent:g}in')
+        if block.first_line_indent:
+            rules.append(f'text-indent: {block.first_line_indent:g}in')
+        return f' style="{"; ".join(rules)}"' if rules else ''
+
+    def __spans(self, spans: list) -> str:
+        out = []
+        for span in spans:
+            text = escape(span.text).replace('\n', '<br>')
+            if isinstance(span, Link):
+                out.append(f'<a href="{escape(span.url)}">{text}</a>')
+                continue
+            if span.bold:
+                text = f'<strong>{text}</strong>'
+            if span.italic:
+                text = f'<em>{text}</em>'
+            rules = []
+            if span.color:
+                rules.append(f'color: #{span.color}')
+            if span.size:
+                rules.append(f'font-size: {span.size:g}pt')
+            if rules:
+                text = f'<span style="{"; ".join(rules)}">{text}</span>'
+            out.append(text)
+        return ''.join(out)
+
+
+class MarkdownEmitter(Emitter):
+    """ Emits Markdown. Layout-only nodes (breaks, colors, indents) are dropped """
+    extension = '.md'
+
+    def write(self, document: Document, output_file: str) -> None:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(self.render(document))
+
+    def render(self, document: Document) -> str:
+        chunks = [self.__block(b) for b in document.blocks]
+        return '\n\n'.join(c for c in chunks if c) + '\n'
+
+    def __block(self, block: object) -> str:
+        if isinstance(block, Heading):
+            return f"{'#' * block.level} {self.__spans(block.spans)}"
+        if isinstance(block, Paragraph):
+            return self.__spans(block.spans)
+        if isinstance(block, Table):
+            rows = [[self.__cell(cell) for cell in row] for row in block.rows]
+            col = block.label_column
+            if block.kind == 'entries':
+                # one item per entry, led by its date; blank dates repeat the previous one
+                entries, date = [], ''
+                for row in rows:
+                    date = row[col] or date
+                    entries.append([date] + row[:col] + row[col + 1:])
+                return self.__list(entries)
+            if block.kind == 'labelled' and rows:
+                # the label becomes the parent item, with one sub-item per row
+                items = self.__list([row[:col] + row[col + 1:] for row in rows])
+                label = rows[0][col]
+                return f"- {label}\n  " + items.replace('\n', '\n  ') if label and items else items
+            return self.__list(rows)
+        return ''
+
+    @staticmethod
+    def __list(rows: list) -> str:
+        items = []
+        for row in rows:
+            cells = [c for c in row if c]
+            if cells:
+                items.append('- ' + ' — '.join(cells).replace('\n', '\n  '))
+        return '\n'.join(items)
+
+    def __cell(self, cell: Cell) -> str:
+        chunks = [self.__block(b) for b in cell.blocks]
+        return '\n'.join(c for c in chunks if c)
+
+    def __spans(self, spans: list) -> str:
+        out = []
+        for span in spans:
+            text = span.text.replace('\n', '  \n')
+            if isinstance(span, Link):
+                out.append(f'[{text}]({span.url})')
+                continue
+            stripped = text.strip()
+            if stripped and (span.bold or span.italic):
+                marker = ('**' if span.bold else '') + ('_' if span.italic else '')
+                lead, trail = text[:len(text) - len(text.lstrip())], text[len(text.rstrip()):]
+                text = f'{lead}{marker}{stripped}{marker[::-1]}{trail}'
+            out.append(text)
+        return ''.join(out).strip()
+
+
+EMITTERS = {cls.extension: cls for cls in [DocxEmitter, HTMLEmitter, MarkdownEmitter]}
+
+
+def get_emitter(output_file: str, **kwargs) -> Emitter:
+    ext = os.path.splitext(output_file)[1].lower()
+    if ext not in EMITTERS:
+        raise ValueError(f"Unsupported output format '{ext}'. Expected one of: {', '.join(EMITTERS)}")
+    return EMITTERS[ext](**kwargs)
@@ -0,0 +1,208 @@
+import json
+from dataclasses import MISSING, Field, dataclass, field, fields
+
+BLACK = '000000'
+BLUE = '3E6CB1'
+DARK_BLUE = '525860'
+GRAY = '62666C'
+LIGHT_GRAY = '80848C'
+
+
+@dataclass(slots=True)
+class Span:
+    """ Run of text sharing the same character formatting """
+    text: str
+    bold: bool = False
+    italic: bool = False
+    color: str | None = None
+    size: float | None = None
+
+
+@dataclass(slots=True)
+class Link:
+    """ Hyperlinked run of text """
+    text: str
+    url: str
+
+
+@dataclass(slots=True)
+class Paragraph:
+    """ Block of spans; indents are expressed in inches """
+    spans: list = field(default_factory=list)
+    align: str | None = None
+    left_indent: float = 0
+    right_indent: float = 0
+    first_line_indent: float = 0
+
+    def add_run(self, text: str = '', **kwargs) -> Span:
+        span = Span(text, **kwargs)
+        self.spans.append(span)
+        return span
+
+    def add_link(self, text: str, url: str) -> Link:
+        link = Link(text, url)
+        self.spans.append(link)
+        return link
+
+
+@dataclass(slots=True)
+class Heading(Paragraph):
+    """ Section title, optionally followed by a horizontal rule """
+    level: int = 1
+    rule: bool = False
+
+
+@dataclass(slots=True)
+class Break:
+    """ Vertical gap, in points """
+    size: float
+
+
+@dataclass(slots=True)
+class PageBreak:
+    pass
+
+
+@dataclass(slots=True)
+class Marker:
+    """ Invisible boundary between logical units (e.g. a work), used to split documents into volumes """
+    kind: str
+
+
+class _Container:
+    """ Mixin for nodes that hold a list of blocks """
+    __slots__ = ()
+
+    def add_paragraph(self, text: str = '', **kwargs) -> Paragraph:
+        p = Paragraph(**kwargs)
+        if text:
+            p.add_run(text)
+        self.blocks.append(p)
+        return p
+
+    def add_heading(self, text: str, level: int = 1, **kwargs) -> Heading:
+        h = Heading(level=level, **kwargs)
+        h.add_run(text)
+        self.blocks.append(h)
+        return h
+
+    def add_break(self, size: float) -> Break:
+        b = Break(size)
+        self.blocks.append(b)
+        return b
+
+    def add_marker(self, kind: str) -> Marker:
+        m = Marker(kind)
+        self.blocks.append(m)
+        return m
+
+    def add_page_break(self) -> PageBreak:
+        b = PageBreak()
+        self.blocks.append(b)
+        return b
+
+    def add_table(self, rows: int, cols: int) -> 'Table':
+        tbl = Table([[Cell() for _ in range(cols)] for _ in range(rows)], [None] * cols)
+        self.blocks.append(tbl)
+        return tbl
+
+
+@dataclass(slots=True)
+class Cell(_Container):
+    """ Table cell; like a word processor cell, it starts with one empty paragraph """
+    blocks: list = field(default_factory=lambda: [Paragraph()])
+
+    @property
+    def paragraphs(self) -> list:
+        return [b for b in self.blocks if isinstance(b, Paragraph)]
+
+
+@dataclass(slots=True)
+class Table:
+    """
+    Grid of cells; column widths and left indent are expressed in inches. `kind` tells emitters what
+    the grid lays out: 'entries' has a date in `label_column` of each row (left blank when it repeats
+    the previous row's), and 'labelled' has one label for the whole table in the first cell of
+    `label_column`. Other tables are plain grids.
+    """
+    rows: list
+    widths: list
+    indent: float = 0
+    kind: str | None = None
+    label_column: int = 0
+
+    def cell(self, row: int, col: int) -> Cell:
+        return self.rows[row][col]
+
+
+@dataclass(slots=True)
+class Document(_Container):
+    """ Root of the intermediate representation """
+    header: list = field(default_factory=list)
+    blocks: list = field(default_factory=list)
+    volume: str | None = None
+
+
+NODE_TAGS = {
+    Span: 's',
+    Link: 'a',
+    Paragraph: 'p',
+    Heading: 'h',
+    Break: 'br',
+    PageBreak: 'pb',
+    Marker: 'm',
+    Cell: 'td',
+    Table: 'tbl',
+    Document: 'doc',
+}
+TAG_NODES = {tag: cls for cls, tag in NODE_TAGS.items()}
+
+
+def _default(f: Field) -> object:
+    if f.default is not MISSING:
+        return f.default
+    if f.default_factory is not MISSING:
+        return f.default_factory()
+    return MISSING
+
+
+def to_dict(node: object) -> object:
+    """ Converts a node into plain JSON types, omitting fields left at their defaults """
+    if isinstance(node, list):
+        return [to_dict(x) for x in node]
+    if type(node) not in NODE_TAGS:
+        return node
+    out = {'t': NODE_TAGS[type(node)]}
+    for f in fields(node):
+        value = getattr(node, f.name)
+        if value != _default(f):
+            out[f.name] = to_dict(value)
+    return out
+
+
+def from_dict(data: object) -> object:
+    """ Inverse of to_dict """
+    if isinstance(data, list):
+        return [from_dict(x) for x in data]
+    if not isinstance(data, dict) or 't' not in data:
+        return data
+    cls = TAG_NODES[data['t']]
+    return cls(**{k: from_dict(v) for k, v in data.items() if k != 't'})
+
+
+def dumps(document: Document) -> str:
+    return json.dumps(to_dict(document), ensure_ascii=False, separators=(',', ':'))
+
+
+def loads(s: str) -> Document:
+    return from_dict(json.loads(s))
+
+
+def dump(document: Document, path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(dumps(document))
+
+
+def load(path: str) -> Document:
+    with open(path, 'r', encoding='utf-8') as f:
+        return loads(f.read())
@@ -3,14 +3,16 @@ from datetime import date
 import sys
 
 cv = CV()
-cv_path = '../felipetovarhenao.github.io/src/json/cv.json'
-works_path = '../felipetovarhenao.github.io/src/json/work-catalog.json'
+json_url = 'https://raw.githubusercontent.com/felipetovarhenao/felipetovarhenao.github.io/main/src/json'
+cv_path = f'{json_url}/cv.json'
+works_path = f'{json_url}/work-catalog.json'
 cv.load_data(cv_path=cv_path, works_path=works_path)
 cv.compile()
 file_id = date.today()
 file = 'cv'
 file_doc = file + '.docx'
 if len(sys.argv) > 1 and sys.argv[1] == '--local':
+    cv.save_ir(file + '.ir.json')
     cv.write(file_doc, open_file=False)
 else:
     cv.write(
@@ -0,0 +1,141 @@
+import gc
+import warnings
+import tracemalloc
+from contextlib import contextmanager
+
+MEMORY_MODES = ('raise', 'degrade')
+
+
+class MemoryBudgetExceeded(MemoryError):
+    pass
+
+
+def format_size(n_bytes: float) -> str:
+    sign = '-' if n_bytes < 0 else ''
+    n_bytes = abs(n_bytes)
+    for unit in ['B', 'KB', 'MB']:
+        if n_bytes < 1024:
+            return f"{sign}{n_bytes:.1f} {unit}"
+        n_bytes /= 1024
+    return f"{sign}{n_bytes:.1f} GB"
+
+
+class MemoryTracker:
+    """
+    Tracks Python allocations per build stage with tracemalloc snapshots; the allocation sites of a
+    stage are those that changed since the last reported stage. When the traced memory goes over
+    `budget` bytes, it either raises MemoryBudgetExceeded ('raise') or switches to low-memory mode
+    ('degrade'), which callers check through `low_memory`.
+    A tracker with neither a budget nor enabled=True does nothing.
+    """
+    # tracemalloc's and the tracker's own bookkeeping and import machinery are noise in allocation reports
+    IGNORED_FILES = (tracemalloc.__file__, __file__, '<frozen importlib._bootstrap>',
+                     '<frozen importlib._bootstrap_external>', '<unknown>')
+
+    def __init__(self, budget: int | None = None, mode: str = 'raise', enabled: bool = False, top: int = 5,
+                 min_report_size: int = 0) -> None:
+        if mode not in MEMORY_MODES:
+            raise ValueError(f"Unknown memory mode '{mode}'. Expected one of: {', '.join(MEMORY_MODES)}")
+        self.budget = budget
+        self.mode = mode
+        self.enabled = enabled or budget is not None
+        self.top = top
+        # grouping a snapshot costs seconds per million live objects; with a threshold, stages that change
+        # traced memory by less are not snapshotted, and their sites are reported with the next stage that is
+        self.min_report_size = min_report_size
+        self.low_memory = False
+        # (stage, size delta, current, peak, [(site, size delta, count delta)])
+        self.stages = []
+        self.__owns_tracing = False
+        self.__stage = None
+        # per-line allocation stats at the end of the previous stage, which the next stage is compared against
+        self.__baseline = None
+        self.__baseline_size = 0
+
+    def start(self) -> None:
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__owns_tracing = True
+
+    def stop(self) -> None:
+        if self.__owns_tracing:
+            tracemalloc.stop()
+            self.__owns_tracing = False
+        self.__baseline = None
+
+    @contextmanager
+    def stage(self, name: str):
+        if not self.enabled or not tracemalloc.is_tracing():
+            yield
+            return
+        self.__stage = name
+        start_size = tracemalloc.get_traced_memory()[0]
+        if self.__baseline is None:
+            self.__baseline, self.__baseline_size = self.__line_stats(), start_size
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                sites = []
+                if abs(current - self.__baseline_size) >= self.min_report_size:
+                    stats = self.__line_stats()
+                    sites = self.__top_sites(stats)
+                    self.__baseline, self.__baseline_size = stats, current
+                self.stages.append((name, current - start_size, current, peak, sites))
+            self.__stage = None
+        self.check(name)
+
+    def check(self, name: str | None = None) -> None:
+        """ Compares traced memory against the budget; cheap enough to call inside render loops """
+        if self.budget is None or self.low_memory or not tracemalloc.is_tracing():
+            return
+        current = tracemalloc.get_traced_memory()[0]
+        if current <= self.budget:
+            return
+        name = name or self.__stage or 'build'
+        if self.mode == 'degrade':
+            warnings.warn(f"Memory budget of {format_size(self.budget)} exceeded during '{name}' "
+                          f"({format_size(current)} traced); switching to low-memory mode")
+            self.low_memory = True
+            gc.collect()
+            return
+        lines = [f"Memory budget of {format_size(self.budget)} exceeded during '{name}': "
+                 f"{format_size(current)} traced."]
+        if self.__stage is None and self.stages and self.stages[-1][0] == name and self.stages[-1][4]:
+            sites = self.stages[-1][4]
+        else:
+            sites = self.__top_sites(self.__line_stats())
+        if sites:
+            lines.append("Top allocation sites in this stage:")
+            lines += [f"  {site}: {format_size(size)} ({count:+d} blocks)" for site, size, count in sites]
+        self.stop()
+        raise MemoryBudgetExceeded('\n'.join(lines))
+
+    def report(self) -> str:
+        lines = []
+        for name, delta, current, peak, sites in self.stages:
+            lines.append(f"{name:<14} {format_size(delta):>10}  (current {format_size(current)}, "
+                         f"peak {format_size(peak)})")
+            lines += [f"    {site}: {format_size(size)} ({count:+d} blocks)" for site, size, count in sites]
+        return '\n'.join(lines)
+
+    @staticmethod
+    def __line_stats() -> dict:
+        # grouping a snapshot walks every trace in Python, so each snapshot is grouped once and reused
+        return {stat.traceback[0]: (stat.size, stat.count) for stat in tracemalloc.take_snapshot().statistics('lineno')}
+
+    def __top_sites(self, stats: dict) -> list:
+        """ Allocation sites that grew or shrank the most since the baseline """
+        sites = []
+        baseline = self.__baseline or {}
+        for frame in stats.keys() | baseline.keys():
+            if frame.filename in self.IGNORED_FILES:
+                continue
+            size, count = stats.get(frame, (0, 0))
+            base_size, base_count = baseline.get(frame, (0, 0))
+            if size != base_size:
+                sites.append((str(frame), size - base_size, count - base_count))
+        sites.sort(key=lambda site: abs(site[1]), reverse=True)
+        return sites[:self.top]
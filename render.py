@@ -0,0 +1,12 @@
+import sys
+import ir
+from emitters import get_emitter
+
+# Renders a cached intermediate representation (see CV.save_ir) to one or more formats,
+# without re-running the pipeline or importing python-docx for non-docx outputs.
+# Usage: python render.py cv.ir.json cv.html cv.md
+if len(sys.argv) < 3:
+    sys.exit("Usage: python render.py <ir_file> <output_file> [<output_file> ...]")
+document = ir.load(sys.argv[1])
+for output_file in sys.argv[2:]:
+    get_emitter(output_file).write(document, output_file)
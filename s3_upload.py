@@ -2,7 +2,7 @@ import boto3
 import os
 from dotenv import load_dotenv
 from subprocess import run
-from docx2pdf import convert
+from convert import convert_all
 
 load_dotenv()
 
@@ -10,7 +10,7 @@ run(['python3', 'main.py', '--local'])
 
 filename = 'cv.pdf'
 
-convert('cv.docx', filename)
+print(convert_all(['cv.docx']).summary())
 
 if not os.path.exists(filename):
     raise FileNotFoundError("This file does not exist")
@@ -0,0 +1,103 @@
+import os
+import json
+import pickle
+import hashlib
+import threading
+import warnings
+from http.client import HTTPException
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'prettycv')
+
+
+def is_url(source: str) -> bool:
+    return source.startswith(('http://', 'https://'))
+
+
+class SourceCache:
+    """
+    Loads JSON sources from local paths or URLs. Remote sources are cached on disk in parsed form and
+    revalidated with conditional requests (ETag / Last-Modified), so an unchanged file is neither
+    downloaded nor parsed again. If a remote source can't be fetched (network error, timeout, HTTP
+    error or invalid JSON), the cached copy is used.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, timeout: float = 10.0, max_workers: int = 4) -> None:
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.max_workers = max_workers
+        # outcome of the last load of each source: 'local', 'fetched', 'not modified' or 'stale'
+        self.status = {}
+
+    def load(self, sources: list) -> list:
+        """ Loads all sources concurrently, preserving their order """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(self.load_one, sources))
+
+    def load_one(self, source: str) -> object:
+        if not is_url(source):
+            with open(source, 'r') as f:
+                data = json.load(f)
+            self.status[source] = 'local'
+            return data
+
+        meta_path, data_path = self.__paths(source)
+        meta = self.__read_meta(meta_path) if os.path.exists(data_path) else {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        try:
+            with urlopen(Request(source, headers=headers), timeout=self.timeout) as response:
+                data = json.loads(response.read())
+                meta = {
+                    'url': source,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                }
+        # OSError covers URLError, HTTPError and timeouts; dropped connections surface as HTTPException, and
+        # a body that isn't JSON (e.g. an error page served with 200) as ValueError
+        except (OSError, HTTPException, ValueError) as e:
+            if isinstance(e, HTTPError) and e.code == 304 and meta:
+                self.status[source] = 'not modified'
+                return self.__read_data(data_path)
+            if not meta:
+                raise
+            warnings.warn(f"Could not fetch {source} ({e}); using cached copy")
+            self.status[source] = 'stale'
+            return self.__read_data(data_path)
+
+        self.__write_cache(meta_path, data_path, meta, data)
+        self.status[source] = 'fetched'
+        return data
+
+    def __paths(self, url: str) -> tuple:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.pickle'
+
+    @staticmethod
+    def __read_meta(path: str) -> dict:
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def __read_data(path: str) -> object:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def __write_cache(self, meta_path: str, data_path: str, meta: dict, data: object) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # data first, then validators, each replaced atomically, so validators never outlive their data
+        for path, mode, dump, obj in [(data_path, 'wb', pickle.dump, data), (meta_path, 'w', json.dump, meta)]:
+            tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp, mode) as f:
+                dump(obj, f)
+            os.replace(tmp, path)
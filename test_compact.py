@@ -0,0 +1,94 @@
+import copy
+import json
+
+import pytest
+
+from catalog import WorksCatalog
+from compact import Performer, StringPool, compact_works
+
+CV_DATA = {
+    'basics': {
+        'name': 'Jane Doe', 'labels': ['composer'], 'phone': '123', 'email': 'a@b.c',
+        'location': {'address': '1 St', 'city': 'X', 'region': 'Y', 'countryCode': 'US'},
+        'profiles': [{'url': 'https://x.com'}], 'interests': ['Music'],
+    },
+    'education': {
+        'degrees': [{'name': 'PhD', 'major': 'Music', 'institution': 'U', 'city': 'C', 'country': 'US',
+                     'date': [2018, 2023], 'minors': ['a'], 'highlights': ['h']}],
+    },
+    'work': {
+        'academic': [{'name': 'TA', 'workplace': 'U', 'city': 'C', 'country': 'US', 'date': [2019, True],
+                      'courses': [{'name': 'c1', 'terms': 'F19'}]}],
+        'publications': {},
+    },
+    'awards': {'academic': [{'name': 'Aw', 'institution': 'I', 'country': 'US', 'date': 2019}]},
+    'skills': {'programming': [{'name': 'Py', 'keywords': ['a'], 'level': 1}]},
+}
+
+WORKS = [
+    {'name': 'Trio', 'year': 2019, 'subtitle': 'for trio', 'duration': 12, 'commission': None, 'awards': [],
+     'performances': [
+         {'event': 'Fest', 'date': '2019-05-01', 'venue': None, 'city': 'Austin', 'country': 'USA',
+          'performers': [{'name': 'Ens', 'role': 'ensemble'}]},
+         {'event': 'Tour', 'date': '2020-02-03', 'venue': 'Hall', 'city': 'Mexico City', 'country': 'Mexico'},
+         {'event': 'Radio', 'date': '2021-07-08', 'venue': 'Studio', 'city': 'Austin', 'country': 'USA',
+          'performers': None},
+     ]},
+    {'name': 'Solo', 'year': 2021, 'subtitle': 'for violin', 'duration': 5, 'commission': 'Commissioned by Y',
+     'awards': [{'name': 'Prize', 'institution': 'I', 'country': 'C', 'date': 2021}],
+     'performances': [
+         {'event': 'Recital', 'date': '2021-09-10', 'venue': 'Hall', 'city': 'Austin', 'country': 'USA',
+          'performers': [{'name': 'Ens', 'role': 'ensemble'}, {'name': 'Ana', 'role': 'violin'}]},
+     ]},
+    {'name': 'Sketch', 'year': 2022, 'subtitle': 'for piano', 'duration': 2, 'commission': None, 'awards': [],
+     'performances': None},
+]
+
+
+def plain(row) -> dict:
+    """ A compacted performance as the dict it was built from """
+    out = dict(row)
+    if out.get('performers'):
+        out['performers'] = [{'name': p.name, 'role': p.role} for p in out['performers']]
+    return out
+
+
+def test_rows_match_source_dicts():
+    works = compact_works(copy.deepcopy(WORKS), StringPool())
+    for work, source in zip(works, WORKS):
+        assert [plain(row) for row in work['performances']] == (source['performances'] or [])
+    venue_null, no_performers, null_performers = works[0]['performances']
+    assert 'venue' in venue_null and venue_null['venue'] is None
+    assert 'performers' not in no_performers and no_performers.get('performers') is None
+    assert 'performers' in null_performers and null_performers['performers'] is None
+    with pytest.raises(KeyError):
+        no_performers['performers']
+
+
+def test_performers_are_shared():
+    works = compact_works(copy.deepcopy(WORKS), StringPool())
+    ens = [row['performers'][0] for work in works[:2] for row in work['performances'] if row.get('performers')]
+    assert len(ens) == 2 and ens[0] is ens[1] and isinstance(ens[0], Performer)
+
+
+@pytest.mark.parametrize('query', [{}, {'country': 'Mexico'}, {'venue': 'Hall'}, {'performer': 'Ens'},
+                                   {'performed_since': '2021'}, {'commissioned': True}, {'sort': 'name'}])
+def test_catalog_queries_match(query):
+    compacted = WorksCatalog(compact_works(copy.deepcopy(WORKS), StringPool()))
+    assert [w['name'] for w in compacted.query(**query)] == [w['name'] for w in WorksCatalog(WORKS).query(**query)]
+
+
+@pytest.mark.parametrize('works_filter', [None, {'country': 'Mexico'}])
+def test_compiled_document_is_unchanged(tmp_path, works_filter):
+    pytest.importorskip('docx')
+    import ir
+    from cv import CV
+    cv_path, works_path = tmp_path / 'cv.json', tmp_path / 'works.json'
+    cv_path.write_text(json.dumps(CV_DATA))
+    works_path.write_text(json.dumps(WORKS))
+    documents = []
+    for compact in (False, True):
+        cv = CV(works_filter=works_filter)
+        cv.load_data(str(cv_path), str(works_path), compact=compact)
+        documents.append(ir.dumps(cv.compile()))
+    assert 'LIST OF WORKS' in documents[0] and documents[0] == documents[1]
@@ -0,0 +1,77 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+
+import pytest
+
+from sources import SourceCache
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    Serves one JSON document with an ETag; `mode` makes it fail with a 500, stall past the client
+    timeout, close the connection without responding, or serve an HTML page
+    """
+    data = {'works': [1, 2, 3]}
+    etag = '"v1"'
+    mode = 'ok'
+
+    def do_GET(self) -> None:
+        if self.mode == 'error':
+            self.send_error(500)
+            return
+        if self.mode == 'drop':
+            self.close_connection = True
+            return
+        if self.mode == 'slow':
+            time.sleep(1)
+        if self.mode == 'ok' and self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = b'<html>Service unavailable</html>' if self.mode == 'html' else json.dumps(self.data).encode()
+        self.send_response(200)
+        self.send_header('ETag', self.etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def url():
+    Handler.mode = 'ok'
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/works.json'
+    server.shutdown()
+    server.server_close()
+
+
+def test_revalidates_with_etag(url, tmp_path):
+    cache = SourceCache(cache_dir=str(tmp_path))
+    assert cache.load_one(url) == Handler.data
+    assert cache.status[url] == 'fetched'
+    assert cache.load_one(url) == Handler.data
+    assert cache.status[url] == 'not modified'
+
+
+@pytest.mark.parametrize('mode', ['error', 'slow', 'drop', 'html'])
+def test_falls_back_to_cached_copy(url, tmp_path, mode):
+    cache = SourceCache(cache_dir=str(tmp_path), timeout=0.2)
+    cache.load_one(url)
+    Handler.mode = mode
+    with pytest.warns(UserWarning, match='using cached copy'):
+        assert cache.load_one(url) == Handler.data
+    assert cache.status[url] == 'stale'
+
+
+def test_raises_without_cached_copy(url, tmp_path):
+    Handler.mode = 'error'
+    with pytest.raises(HTTPError):
+        SourceCache(cache_dir=str(tmp_path)).load_one(url)
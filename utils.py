@@ -5,6 +5,7 @@ from docx.opc.constants import RELATIONSHIP_TYPE
 from docx.text.paragraph import Paragraph, Run
 from docx.table import Table
 from docx.shared import RGBColor
+import ir
 
 MONTHS = [
     'Jan.',
@@ -22,11 +23,11 @@ MONTHS = [
 ]
 # from docx import Document
 
-BLACK = RGBColor(0, 0, 0)
-BLUE = RGBColor.from_string('3E6CB1')
-DARK_BLUE = RGBColor.from_string('525860')
-GRAY = RGBColor.from_string('62666c')
-LIGHT_GRAY = RGBColor.from_string('80848C')
+BLACK = RGBColor.from_string(ir.BLACK)
+BLUE = RGBColor.from_string(ir.BLUE)
+DARK_BLUE = RGBColor.from_string(ir.DARK_BLUE)
+GRAY = RGBColor.from_string(ir.GRAY)
+LIGHT_GRAY = RGBColor.from_string(ir.LIGHT_GRAY)
 
 
 def add_hyperlink(paragraph: Paragraph, text: str, url: str) -> Run:
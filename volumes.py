@@ -0,0 +1,198 @@
+import os
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+from ir import Document, Heading, Paragraph, Break, PageBreak, Table, Marker
+from emitters import get_emitter
+from convert import convert_all
+
+SPLIT_MODES = ('section', 'works', 'pages')
+CONTINUED = ' (cont.)'
+
+# rough layout model for page budgets, tuned for the default 10.5pt font on letter paper
+CHARS_PER_LINE = 95
+LINES_PER_PAGE = 48
+LINE_HEIGHT = 12.6
+
+
+class _Unit:
+    """ Run of top-level blocks that must stay in the same volume """
+    __slots__ = ('kind', 'blocks', 'n_works')
+
+    def __init__(self, kind: str, blocks: list) -> None:
+        self.kind = kind
+        self.blocks = blocks
+        self.n_works = int(kind == 'work')
+
+
+def _units(document: Document) -> list:
+    blocks = document.blocks
+    starts = []
+    for i, block in enumerate(blocks):
+        if isinstance(block, Heading) and block.level == 1:
+            # the gap (or page break) before a section heading belongs to that section
+            j = i
+            while j > 0 and isinstance(blocks[j - 1], (Break, PageBreak)):
+                j -= 1
+            starts.append((j, 'section'))
+        elif isinstance(block, Marker) and block.kind == 'work':
+            starts.append((i, 'work'))
+    if not starts or starts[0][0] > 0:
+        starts.insert(0, (0, 'front'))
+    bounds = [i for i, _ in starts[1:]] + [len(blocks)]
+    units = [_Unit(kind, blocks[i:end]) for (i, kind), end in zip(starts, bounds)]
+
+    # keep front matter with the first section, and each section heading with its first work
+    merged = []
+    for unit in units:
+        prev = merged[-1] if merged else None
+        if prev and (prev.kind == 'front' or (prev.kind == 'section' and not prev.n_works and unit.kind == 'work')):
+            prev.blocks = prev.blocks + unit.blocks
+            prev.n_works += unit.n_works
+            if prev.kind == 'front':
+                prev.kind = unit.kind
+        else:
+            merged.append(unit)
+    return merged
+
+
+def _text_lines(text: str) -> int:
+    return sum(max(1, ceil(len(line) / CHARS_PER_LINE)) for line in text.split('\n'))
+
+
+def _block_lines(block: object) -> float:
+    if isinstance(block, Paragraph):
+        return _text_lines(''.join(span.text for span in block.spans))
+    if isinstance(block, Break):
+        return block.size / LINE_HEIGHT
+    if isinstance(block, Table):
+        return sum(max(sum(_block_lines(b) for b in cell.blocks) for cell in row) for row in block.rows)
+    return 0
+
+
+def estimate_pages(blocks: list) -> float:
+    """ Approximate number of pages taken by a list of blocks """
+    lines = 0
+    for block in blocks:
+        if isinstance(block, PageBreak):
+            lines = ceil(lines / LINES_PER_PAGE) * LINES_PER_PAGE
+        else:
+            lines += _block_lines(block)
+    return lines / LINES_PER_PAGE
+
+
+def split(document: Document, by: str = 'section', budget: int | None = None) -> list:
+    """
+    Splits a document into volumes at section or work boundaries:
+    'section' starts a volume per section, 'works' puts at most `budget` works in each volume of the
+    list of works, and 'pages' packs volumes up to an estimated `budget` pages.
+    """
+    if by not in SPLIT_MODES:
+        raise ValueError(f"Unknown split mode '{by}'. Expected one of: {', '.join(SPLIT_MODES)}")
+    if by != 'section' and not budget:
+        raise ValueError(f"Splitting by {by} requires a positive budget")
+
+    volumes = []
+    n_works = cost = 0
+    section_heading = subsection = None
+    for unit in _units(document):
+        if by == 'section':
+            new = unit.kind == 'section'
+        elif by == 'works':
+            new = (unit.kind == 'section' and (unit.n_works or n_works)) or n_works + unit.n_works > budget
+        else:
+            new = cost + estimate_pages(unit.blocks) > budget
+        if new and volumes and volumes[-1]:
+            volumes.append([])
+            n_works = cost = 0
+            if unit.kind == 'work':
+                volumes[-1] += _continuation(unit, section_heading, subsection)
+        elif not volumes:
+            volumes.append([])
+        volumes[-1] += unit.blocks
+        n_works += unit.n_works
+        cost += estimate_pages(unit.blocks) if by == 'pages' else 0
+
+        for i, block in enumerate(unit.blocks):
+            if isinstance(block, Heading) and block.level == 1:
+                section_heading, subsection = block, None
+            elif isinstance(block, Heading) and block.level == 2:
+                subsection = unit.blocks[max(i - 1, 0):i + 2]
+
+    if len(volumes) < 2:
+        return [document]
+    return [Document(header=document.header, blocks=_strip_leading_gaps(blocks), volume=f'Vol. {i + 1}')
+            for i, blocks in enumerate(volumes)]
+
+
+def _strip_leading_gaps(blocks: list) -> list:
+    """ Drops the breaks a volume inherits from before its first section, so it doesn't open on a blank page """
+    i = 0
+    while i < len(blocks) and isinstance(blocks[i], (Break, PageBreak)):
+        i += 1
+    return blocks[i:]
+
+
+def _continuation(unit: _Unit, section_heading: Heading | None, subsection: list | None) -> list:
+    """ Repeats the running section (and year) headings at the top of a volume that starts mid-section """
+    blocks = []
+    if section_heading is not None:
+        heading = copy.deepcopy(section_heading)
+        heading.spans[-1].text += CONTINUED
+        blocks.append(heading)
+    starts_subsection = any(isinstance(b, Heading) and b.level == 2 for b in unit.blocks[:3])
+    if subsection and not starts_subsection:
+        blocks += copy.deepcopy(subsection)
+    return blocks
+
+
+def index(volumes: list, targets: list, header: list) -> Document:
+    """ Small document linking each volume, with the sections (and years) it covers """
+    doc = Document(header=header)
+    doc.add_heading("VOLUMES", rule=True)
+    doc.add_break(7)
+    for volume, target in zip(volumes, targets):
+        sections = [b.spans[0].text for b in volume.blocks if isinstance(b, Heading) and b.level == 1]
+        years = [b.spans[0].text for b in volume.blocks if isinstance(b, Heading) and b.level == 2
+                 and b.spans[0].text.isdigit()]
+        if sections and years:
+            sections[-1] += f" ({years[0]} – {years[-1]})" if years[0] != years[-1] else f" ({years[0]})"
+        p = doc.add_paragraph()
+        p.add_link(volume.volume, target)
+        p.add_run(f". {', '.join(sections)}.")
+        doc.add_break(3.5)
+    return doc
+
+
+def build(document: Document, output_file: str, font: str, font_size: float) -> str:
+    """ Emits one document; runs in worker processes """
+    get_emitter(output_file, font=font, font_size=font_size).write(document, output_file)
+    return output_file
+
+
+def write_volumes(document: Document, output_file: str, by: str, budget: int | None, font: str, font_size: float,
+                  pdf: bool = False, workers: int | None = None) -> list:
+    """
+    Writes each volume next to output_file (cv.docx -> cv_vol1.docx, ...) and an index at output_file.
+    Volumes are built in parallel worker processes, then converted as one batch when pdf=True.
+    When everything fits in one volume, the whole document is written to output_file instead.
+    """
+    stem, ext = os.path.splitext(output_file)
+    if pdf and ext.lower() != '.docx':
+        raise ValueError("PDF conversion requires DOCX output")
+    volumes = split(document, by, budget)
+    if len(volumes) == 1:
+        build(document, output_file, font, font_size)
+        if pdf:
+            convert_all([output_file], workers=workers)
+        return [output_file]
+    paths = [f'{stem}_vol{i + 1}{ext}' for i in range(len(volumes))]
+    targets = [os.path.basename(os.path.splitext(path)[0] + ('.pdf' if pdf else ext)) for path in paths]
+    jobs = list(zip(volumes, paths)) + [(index(volumes, targets, document.header), output_file)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(build, doc, path, font, font_size) for doc, path in jobs]
+        for future in futures:
+            future.result()
+    if pdf:
+        convert_all(paths + [output_file], workers=workers)
+    return paths